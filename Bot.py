@@ -9,6 +9,10 @@ from highrise import BaseBot, User, Position, AnchorPosition
 from highrise.__main__ import *
 from emotes import EmoteManager
 from config import BotConfig
+from profiler import LoopProfiler
+from analytics import UsageAnalytics
+from worker_pool import WorkerPool
+from helper_bot import run_sdk_session
 from utils import MessageSplitter, CommandParser
 
 logger = logging.getLogger(__name__)
@@ -36,6 +40,31 @@ class HighriseEmoteBot(BaseBot):
         # Room info
         self.room_name = ""
         
+        # Opt-in event loop profiling (started from main.py)
+        self.profiler: Optional[LoopProfiler] = None
+        if config.profile_enabled:
+            self.profiler = LoopProfiler(
+                slow_callback_ms=config.profile_slow_callback_ms,
+                sample_interval=config.profile_sample_interval,
+                output_path=config.profile_output
+            )
+            self.profiler.instrument(self)
+        
+        # Usage analytics (fixed memory, flushed periodically)
+        self.analytics = UsageAnalytics(
+            path=config.analytics_path,
+            window_hours=config.analytics_window_hours
+        )
+        self.analytics.load()
+        self.analytics_task: Optional[asyncio.Task] = None
+        
+        # Optional helper sessions that share emote loop ticks
+        self.worker_pool = WorkerPool(
+            config.room_id,
+            config.helper_tokens,
+            runner=config.helper_runner or run_sdk_session
+        )
+        
         # Moderation system
         self.moderators = set()  # Store moderator usernames
         self.super_admins = {"SHIVAM_00", "intothesky"}  # Super admin usernames
@@ -102,6 +131,14 @@ class HighriseEmoteBot(BaseBot):
     async def on_start(self, session_metadata):
         """Called when bot starts"""
         logger.info("Bot connected to Highrise")
+        if self.profiler:
+            self.profiler.wrap_highrise(self)
+        if not self.analytics_task:
+            self.analytics_task = asyncio.create_task(
+                self.analytics.run_flush_loop(self.config.analytics_flush_interval)
+            )
+        if self.config.helper_tokens:
+            self.worker_pool.start()
         try:
             # Try to get room information
             room_info = await self.highrise.get_room_users()
@@ -121,6 +158,17 @@ class HighriseEmoteBot(BaseBot):
             logger.error(f"Error on bot start: {e}")
             self.room_name = "this amazing room"
     
+    async def shutdown(self):
+        """Stop background tasks, flushing analytics before exit"""
+        if self.analytics_task:
+            # run_flush_loop does a final flush when cancelled
+            self.analytics_task.cancel()
+            await asyncio.gather(self.analytics_task, return_exceptions=True)
+            self.analytics_task = None
+        else:
+            await self.analytics.flush()
+        await self.worker_pool.stop()
+    
     async def on_user_join(self, user: User, position: Position | AnchorPosition):
         """Called when a user joins the room"""
         try:
@@ -138,12 +186,14 @@ class HighriseEmoteBot(BaseBot):
             # Check for direct teleport commands (f1-f10) without !
             teleport_commands = ['f1', 'f2', 'f3', 'f4', 'f5', 'f6', 'f7', 'f8', 'f9', 'f10']
             if message.lower() in teleport_commands:
+                self.analytics.record_command(self.config.room_id, user.id, message.lower())
                 await self.handle_teleport_command(user, message.lower())
                 return
             
             # Check for VIP teleport (only for moderators)
             if message.lower() == 'vip':
                 if self.is_moderator(user.username):
+                    self.analytics.record_command(self.config.room_id, user.id, 'vip')
                     await self.handle_teleport_command(user, 'vip')
                 else:
                     await self.send_error_message("Only moderators can use VIP teleport!")
@@ -169,6 +219,7 @@ class HighriseEmoteBot(BaseBot):
                 if emote_identifier.isdigit():
                     emote_info = self.emote_manager.find_emote_by_number(int(emote_identifier))
                     if emote_info:
+                        self.analytics.record_command(self.config.room_id, user.id, 'modemote')
                         await self.handle_mod_emote_command(user, target_username, emote_info)
                         return
             
@@ -185,8 +236,8 @@ class HighriseEmoteBot(BaseBot):
                 
             command = command_data['command']
             args = command_data['args']
-            
-            # Handle commands
+            # Handle commands (unrecognised ones are not counted by analytics)
+            recognised = True
             if command == 'help':
                 await self.handle_help_command(user)
             elif command == 'emotes':
@@ -196,6 +247,7 @@ class HighriseEmoteBot(BaseBot):
             elif command == 'stop':
                 await self.handle_stop_command(user)
             elif command.startswith('setf') or command == 'setvip':
+                recognised = command[3:] in self.teleport_positions
                 await self.handle_set_teleport_command(user, command, args)
             elif command == 'summon':
                 await self.handle_summon_command(user, args)
@@ -233,9 +285,15 @@ class HighriseEmoteBot(BaseBot):
                 await self.handle_off_command(user)
             elif command == 'modlist':
                 await self.handle_modlist_command(user)
+            elif command == 'stats':
+                await self.handle_stats_command(user)
             else:
                 # Check if it's an emote command
+                recognised = self.emote_manager.find_emote(command) is not None
                 await self.handle_emote_command(user, command, args)
+            
+            if recognised:
+                self.analytics.record_command(self.config.room_id, user.id, command)
                 
         except Exception as e:
             logger.error(f"Error handling chat message: {e}")
@@ -248,7 +306,7 @@ class HighriseEmoteBot(BaseBot):
             help_part1 = "🤖 **Help (1/3)** 🤖\n**Emotes:** 1-84 (e.g., 1, 25, 84)\n**Teleport:** f1-f10, vip (mods)\n**Loop:** !loop <number>, !stop\n**List:** !emotes"
             
             # Part 2: Fun Commands (shorter)
-            help_part2 = "🤖 **Help (2/3)** 🤖\n**Fun:** !rizz @user, !ship @u1 @u2\n**More:** !roast @user, !iq @user\n**Other:** !joke, !straightmeter\n**Spam:** !spam <msg> <num>"
+            help_part2 = "🤖 **Help (2/3)** 🤖\n**Fun:** !rizz @user, !ship @u1 @u2\n**More:** !roast @user, !iq @user\n**Other:** !joke, !straightmeter, !stats\n**Spam:** !spam <msg> <num>"
             
             # Part 3: Moderator Commands (shorter)
             help_part3 = "🤖 **Help (3/3)** 🤖\n**Info:** Basic commands for all users"
@@ -311,6 +369,28 @@ class HighriseEmoteBot(BaseBot):
             logger.error(f"Error handling emotes command: {e}")
             await self.send_error_message("Failed to retrieve emote list.")
     
+    async def handle_stats_command(self, user: User):
+        """Handle the !stats command"""
+        try:
+            hour = self.analytics.summary(self.config.room_id, hours=1)
+            day = self.analytics.summary(self.config.room_id, hours=self.config.analytics_window_hours)
+            
+            top_emotes = ", ".join(f"{name}({count})" for name, count in day['top_emotes'][:3]) or "none"
+            top_commands = ", ".join(f"{name}({count})" for name, count in day['top_commands'][:3]) or "none"
+            
+            stats_message = (
+                f"📊 **Stats** 📊\n"
+                f"**This hour:** {hour['commands']} cmds, {hour['emotes']} emotes, ~{hour['users']} users\n"
+                f"**Last {self.config.analytics_window_hours}h:** {day['commands']} cmds, {day['emotes']} emotes, ~{day['users']} users\n"
+                f"**Top emotes:** {top_emotes}\n"
+                f"**Top cmds:** {top_commands}"
+            )
+            await self.send_whisper(user, stats_message)
+            
+        except Exception as e:
+            logger.error(f"Error handling stats command: {e}")
+            await self.send_error_message("Failed to retrieve stats.")
+    
     async def handle_loop_command(self, user: User, args: List[str]):
         """Handle the !loop command"""
         if not args:
@@ -382,6 +462,7 @@ class HighriseEmoteBot(BaseBot):
             if user.id in self.loop_tasks:
                 self.loop_tasks[user.id].cancel()
                 del self.loop_tasks[user.id]
+            self.worker_pool.release(user.id)
             
             if user.id in self.active_loops:
                 emote_name = self.active_loops[user.id]['emote']['name']
@@ -396,7 +477,10 @@ class HighriseEmoteBot(BaseBot):
         """Background task for emote looping"""
         try:
             while user.id in self.active_loops:
-                await self.play_emote(user, emote_info)
+                if self.worker_pool.has_helpers:
+                    await self.play_emote_via_pool(user, emote_info)
+                else:
+                    await self.play_emote(user, emote_info)
                 await asyncio.sleep(self.config.loop_interval)  # Wait configured interval between emotes
         except asyncio.CancelledError:
             logger.info(f"Emote loop cancelled for {user.username}")
@@ -404,9 +488,19 @@ class HighriseEmoteBot(BaseBot):
             logger.error(f"Error in emote loop task: {e}")
             if user.id in self.active_loops:
                 del self.active_loops[user.id]
+            self.worker_pool.release(user.id)
+    
+    async def play_emote_via_pool(self, user: User, emote_info: Dict):
+        """Play an emote through a helper session, falling back to this bot"""
+        self.analytics.record_emote(self.config.room_id, user.id, emote_info['name'])
+        try:
+            await self.worker_pool.send_emote(emote_info['id'], user.id, fallback=self.highrise)
+        except Exception as e:
+            logger.error(f"Error playing emote via worker pool: {e}")
     
     async def play_emote(self, user: User, emote_info: Dict):
         """Play an emote for a user"""
+        self.analytics.record_emote(self.config.room_id, user.id, emote_info['name'])
         try:
             # Get user position
             room_users = await self.highrise.get_room_users()
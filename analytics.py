@@ -0,0 +1,292 @@
+"""
+Usage Analytics - fixed memory command and emote counters
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _hash64(item: str, seed: int = 0) -> int:
+    """Stable 64-bit hash (Python's hash() is randomized per process)"""
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=8, salt=seed.to_bytes(16, "little")).digest()
+    return int.from_bytes(digest, "little")
+
+
+class HyperLogLog:
+    """Approximate distinct counter using 2^precision one-byte registers"""
+
+    def __init__(self, precision: int = 10):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+
+    def add(self, item: str):
+        h = _hash64(item)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        for i, value in enumerate(other.registers):
+            if value > self.registers[i]:
+                self.registers[i] = value
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.size)
+        estimate = alpha * self.size * self.size / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # Small range correction (linear counting)
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+    def clear(self):
+        self.registers = bytearray(self.size)
+
+
+class CountMinSketch:
+    """Approximate frequency table with a bounded top-k candidate list"""
+
+    def __init__(self, width: int = 256, depth: int = 4, top_k: int = 10):
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.table = array("I", bytes(4 * width * depth))
+        self.top: Dict[str, int] = {}  # name -> estimated count
+
+    def _cells(self, item: str):
+        for row in range(self.depth):
+            yield row * self.width + _hash64(item, seed=row + 1) % self.width
+
+    def add(self, item: str, count: int = 1):
+        estimate = None
+        for cell in self._cells(item):
+            self.table[cell] += count
+            value = self.table[cell]
+            estimate = value if estimate is None else min(estimate, value)
+        self._update_top(item, estimate)
+
+    def estimate(self, item: str) -> int:
+        return min(self.table[cell] for cell in self._cells(item))
+
+    def merge(self, other: "CountMinSketch"):
+        for i, value in enumerate(other.table):
+            self.table[i] += value
+        for item in other.top:
+            self._update_top(item, self.estimate(item))
+
+    def most_common(self, n: int = 5) -> List[Tuple[str, int]]:
+        return sorted(self.top.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def clear(self):
+        self.table = array("I", bytes(4 * self.width * self.depth))
+        self.top = {}
+
+    def _update_top(self, item: str, estimate: int):
+        if item in self.top or len(self.top) < self.top_k:
+            self.top[item] = estimate
+            return
+        lowest = min(self.top, key=self.top.get)
+        if estimate > self.top[lowest]:
+            del self.top[lowest]
+            self.top[item] = estimate
+
+
+class HourBucket:
+    """Aggregates for one hour of one room"""
+
+    def __init__(self, hour: int = -1):
+        self.hour = hour
+        self.command_count = 0
+        self.emote_count = 0
+        self.users = HyperLogLog()
+        self.commands = CountMinSketch()
+        self.emotes = CountMinSketch()
+
+    def reset(self, hour: int):
+        self.hour = hour
+        self.command_count = 0
+        self.emote_count = 0
+        self.users.clear()
+        self.commands.clear()
+        self.emotes.clear()
+
+    def to_dict(self) -> Dict:
+        return {
+            "hour": self.hour,
+            "command_count": self.command_count,
+            "emote_count": self.emote_count,
+            "users": base64.b64encode(bytes(self.users.registers)).decode("ascii"),
+            "commands": _sketch_to_dict(self.commands),
+            "emotes": _sketch_to_dict(self.emotes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HourBucket":
+        bucket = cls(data["hour"])
+        bucket.command_count = data["command_count"]
+        bucket.emote_count = data["emote_count"]
+        bucket.users.registers = bytearray(base64.b64decode(data["users"]))
+        _sketch_from_dict(bucket.commands, data["commands"])
+        _sketch_from_dict(bucket.emotes, data["emotes"])
+        return bucket
+
+
+class RoomStats:
+    """Ring buffer of hourly buckets for a single room"""
+
+    def __init__(self, window_hours: int = 24):
+        self.window_hours = window_hours
+        self.buckets = [HourBucket() for _ in range(window_hours)]
+
+    def bucket_for(self, hour: int) -> HourBucket:
+        bucket = self.buckets[hour % self.window_hours]
+        if bucket.hour != hour:
+            bucket.reset(hour)
+        return bucket
+
+    def summary(self, hours: int, now_hour: int) -> Dict:
+        """Merge the last `hours` buckets into one view"""
+        users = HyperLogLog()
+        commands = CountMinSketch()
+        emotes = CountMinSketch()
+        command_count = 0
+        emote_count = 0
+        for bucket in self.buckets:
+            if now_hour - hours < bucket.hour <= now_hour:
+                command_count += bucket.command_count
+                emote_count += bucket.emote_count
+                users.merge(bucket.users)
+                commands.merge(bucket.commands)
+                emotes.merge(bucket.emotes)
+        return {
+            "commands": command_count,
+            "emotes": emote_count,
+            "users": users.count() if command_count or emote_count else 0,
+            "top_commands": commands.most_common(),
+            "top_emotes": emotes.most_common(),
+        }
+
+
+class UsageAnalytics:
+    """Per-room command and emote usage counters kept in fixed memory"""
+
+    def __init__(self, path: str = "analytics.json", window_hours: int = 24):
+        self.path = path
+        self.window_hours = window_hours
+        self.rooms: Dict[str, RoomStats] = {}
+        self.dirty = False
+
+    def record_command(self, room_id: str, user_id: str, command: str):
+        bucket = self._current_bucket(room_id)
+        bucket.command_count += 1
+        bucket.users.add(user_id)
+        bucket.commands.add(command.lower())
+        self.dirty = True
+
+    def record_emote(self, room_id: str, user_id: str, emote_name: str):
+        bucket = self._current_bucket(room_id)
+        bucket.emote_count += 1
+        bucket.users.add(user_id)
+        bucket.emotes.add(emote_name.lower())
+        self.dirty = True
+
+    def summary(self, room_id: str, hours: int = 1) -> Dict:
+        """Aggregate the current clock hour and the `hours - 1` before it for a room"""
+        room = self.rooms.get(room_id)
+        if not room:
+            return {"commands": 0, "emotes": 0, "users": 0, "top_commands": [], "top_emotes": []}
+        return room.summary(min(hours, self.window_hours), self._now_hour())
+
+    def load(self):
+        """Restore aggregates from the last flush, if any"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            for room_id, buckets in data.get("rooms", {}).items():
+                room = RoomStats(self.window_hours)
+                for bucket_data in buckets:
+                    bucket = HourBucket.from_dict(bucket_data)
+                    if bucket.hour >= 0:
+                        room.buckets[bucket.hour % self.window_hours] = bucket
+                self.rooms[room_id] = room
+            logger.info(f"Loaded analytics for {len(self.rooms)} room(s)")
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Error loading analytics: {e}")
+
+    async def flush(self):
+        """Write aggregates to disk without blocking the event loop"""
+        if not self.dirty:
+            return
+        data = {
+            "rooms": {
+                room_id: [b.to_dict() for b in room.buckets if b.hour >= 0]
+                for room_id, room in self.rooms.items()
+            }
+        }
+        self.dirty = False
+        try:
+            await asyncio.to_thread(self._write, data)
+        except OSError as e:
+            self.dirty = True
+            logger.error(f"Error flushing analytics: {e}")
+
+    async def run_flush_loop(self, interval: float):
+        """Background task that flushes periodically"""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.flush()
+                except Exception as e:
+                    # Keep flushing on later ticks even if one write fails
+                    self.dirty = True
+                    logger.error(f"Error flushing analytics: {e}")
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    def _write(self, data: Dict):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def _current_bucket(self, room_id: str) -> HourBucket:
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = self.rooms[room_id] = RoomStats(self.window_hours)
+        return room.bucket_for(self._now_hour())
+
+    @staticmethod
+    def _now_hour() -> int:
+        return int(time.time() // 3600)
+
+
+def _sketch_to_dict(sketch: CountMinSketch) -> Dict:
+    return {
+        "table": base64.b64encode(sketch.table.tobytes()).decode("ascii"),
+        "top": dict(sketch.top),  # copied: the live dict keeps changing on the loop thread
+    }
+
+
+def _sketch_from_dict(sketch: CountMinSketch, data: Dict):
+    table = array("I")
+    table.frombytes(base64.b64decode(data["table"]))
+    if len(table) == sketch.width * sketch.depth:
+        sketch.table = table
+    sketch.top = dict(data["top"])
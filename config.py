@@ -2,8 +2,8 @@
 Bot Configuration
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
 
 @dataclass
 class BotConfig:
@@ -13,6 +13,15 @@ class BotConfig:
     max_message_length: int = 256
     loop_interval: float = 6.0
     command_prefix: str = "!"
+    profile_enabled: bool = False
+    profile_slow_callback_ms: float = 100.0
+    profile_sample_interval: float = 0.01
+    profile_output: str = "profile.folded"
+    analytics_path: str = "analytics.json"
+    analytics_flush_interval: float = 300.0
+    analytics_window_hours: int = 24
+    helper_tokens: List[str] = field(default_factory=list)
+    helper_runner: Optional[Callable] = None  # worker pool session runner (defaults to the SDK)
     
     def __post_init__(self):
         """Validate configuration after initialization"""
@@ -24,4 +33,12 @@ class BotConfig:
             raise ValueError("Max message length must be positive")
         if self.loop_interval <= 0:
             raise ValueError("Loop interval must be positive")
+        if self.profile_slow_callback_ms <= 0:
+            raise ValueError("Profile slow callback threshold must be positive")
+        if self.profile_sample_interval <= 0:
+            raise ValueError("Profile sample interval must be positive")
+        if self.analytics_flush_interval <= 0:
+            raise ValueError("Analytics flush interval must be positive")
+        if self.analytics_window_hours <= 0:
+            raise ValueError("Analytics window must be positive")
           
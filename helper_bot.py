@@ -0,0 +1,24 @@
+"""
+Helper Bot - SDK session used by the worker pool
+"""
+
+from highrise import BaseBot
+from highrise.__main__ import BotDefinition, main as run_bots
+from worker_pool import HelperSession
+
+
+class HelperBot(BaseBot):
+    """Minimal bot that only reports when its session is ready"""
+
+    def __init__(self, session: HelperSession):
+        super().__init__()
+        self.session = session
+
+    async def on_start(self, session_metadata):
+        """Called when the helper connects (or reconnects)"""
+        self.session.mark_connected(self.highrise)
+
+
+async def run_sdk_session(session: HelperSession, room_id: str):
+    """Default worker pool runner: connect a helper through the Highrise SDK"""
+    await run_bots([BotDefinition(HelperBot(session), room_id, session.token)])
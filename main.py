@@ -35,13 +35,27 @@ async def main():
 
         config = BotConfig(
             bot_token=bot_token,
-            room_id=room_id
+            room_id=room_id,
+            profile_enabled=os.getenv("HIGHRISE_PROFILE", "") == "1",
+            profile_slow_callback_ms=float(os.getenv("HIGHRISE_PROFILE_SLOW_MS", "100")),
+            profile_sample_interval=float(os.getenv("HIGHRISE_PROFILE_INTERVAL", "0.01")),
+            profile_output=os.getenv("HIGHRISE_PROFILE_OUTPUT", "profile.folded"),
+            helper_tokens=[t.strip() for t in os.getenv("HIGHRISE_HELPER_TOKENS", "").split(",") if t.strip()]
         )
 
         bot = HighriseEmoteBot(config)
         logger.info("Starting Highrise Emote Bot...")
 
-        await bot.start()
+        if bot.profiler:
+            # Send SIGUSR1 to the process to dump a profile while running
+            bot.profiler.start(asyncio.get_running_loop())
+
+        try:
+            await bot.start()
+        finally:
+            await bot.shutdown()
+            if bot.profiler:
+                bot.profiler.stop()
 
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
@@ -0,0 +1,224 @@
+"""
+Event Loop Profiler - opt-in hot spot detection
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (handler path, task) of the handler currently running, used to nest calls under it.
+# Tasks spawned inside a handler inherit this context, so the task is checked too.
+_current_handler: contextvars.ContextVar[Optional[Tuple[str, asyncio.Task]]] = contextvars.ContextVar(
+    "current_handler", default=None
+)
+
+
+def _attribution_prefix() -> Optional[str]:
+    """Name the running handler, or the background task's coroutine outside one"""
+    task = asyncio.current_task()
+    entry = _current_handler.get()
+    if entry and entry[1] is task:
+        return entry[0]
+    if task is not None:
+        return getattr(task.get_coro(), "__qualname__", None)
+    return None
+
+
+class _SlowCallbackCounter(logging.Handler):
+    """Counts the slow callback warnings asyncio emits in debug mode"""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        if str(record.msg).startswith("Executing"):
+            self.count += 1
+
+
+class _HighriseProxy:
+    """Wraps the highrise client so each API call is timed"""
+
+    def __init__(self, highrise, profiler: "LoopProfiler"):
+        self._highrise = highrise
+        self._profiler = profiler
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._highrise, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def timed(*args, **kwargs):
+            prefix = _attribution_prefix()
+            path = f"{prefix};highrise.{name}" if prefix else f"highrise.{name}"
+            start = time.perf_counter()
+            try:
+                return await attr(*args, **kwargs)
+            finally:
+                self._profiler.record(path, time.perf_counter() - start)
+
+        return timed
+
+
+class LoopProfiler:
+    """Samples the event loop thread and attributes time to bot commands"""
+
+    def __init__(self, slow_callback_ms: float = 100.0, sample_interval: float = 0.01,
+                 output_path: str = "profile.folded"):
+        self.slow_callback_ms = slow_callback_ms
+        self.sample_interval = sample_interval
+        self.output_path = output_path
+
+        self.samples: Counter = Counter()  # folded stack -> sample count
+        self.timings: Dict[str, Tuple[int, float]] = {}  # path -> (calls, seconds)
+        self._lock = threading.Lock()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._slow_counter = _SlowCallbackCounter()
+        self._saved_debug: Optional[Tuple[bool, float]] = None  # loop settings before start()
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Enable slow callback detection and start sampling the given loop"""
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+
+        self._saved_debug = (loop.get_debug(), loop.slow_callback_duration)
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.slow_callback_ms / 1000.0
+        logging.getLogger("asyncio").addHandler(self._slow_counter)
+
+        self._stop_event.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="loop-profiler", daemon=True)
+        self._sampler.start()
+
+        # Dump on SIGUSR1 where the platform supports it
+        if hasattr(signal, "SIGUSR1"):
+            try:
+                loop.add_signal_handler(signal.SIGUSR1, self.dump)
+            except (NotImplementedError, RuntimeError):
+                logger.warning("Signal dumps not supported on this platform")
+
+        logger.info(f"Profiler started (slow callback: {self.slow_callback_ms}ms, "
+                    f"sample interval: {self.sample_interval}s)")
+
+    def stop(self):
+        """Stop sampling and write a final dump"""
+        self._stop_event.set()
+        if self._sampler:
+            self._sampler.join(timeout=1.0)
+            self._sampler = None
+        if self._loop and hasattr(signal, "SIGUSR1"):
+            try:
+                self._loop.remove_signal_handler(signal.SIGUSR1)
+            except (NotImplementedError, RuntimeError):
+                pass
+        if self._loop and self._saved_debug:
+            self._loop.set_debug(self._saved_debug[0])
+            self._loop.slow_callback_duration = self._saved_debug[1]
+            self._saved_debug = None
+        logging.getLogger("asyncio").removeHandler(self._slow_counter)
+        self.dump()
+
+    def instrument(self, bot):
+        """Time every handle_* command on the bot instance"""
+        for name in dir(type(bot)):
+            if not name.startswith("handle_"):
+                continue
+            method = getattr(bot, name)
+            if asyncio.iscoroutinefunction(method):
+                setattr(bot, name, self._wrap_handler(name, method))
+
+    def wrap_highrise(self, bot):
+        """Replace bot.highrise with a proxy that times each API call"""
+        if not isinstance(bot.highrise, _HighriseProxy):
+            bot.highrise = _HighriseProxy(bot.highrise, self)
+
+    def record(self, path: str, elapsed: float):
+        """Add one timed call to the attribution table"""
+        with self._lock:
+            calls, total = self.timings.get(path, (0, 0.0))
+            self.timings[path] = (calls + 1, total + elapsed)
+
+    def dump(self, path: Optional[str] = None):
+        """Write sampled stacks and command timings in folded flame graph format
+
+        Timings are wall time including awaits, so a handler that sleeps between
+        whispers shows up wide here without ever stalling the loop; use the
+        sampled stacks and slow callback count to find real stalls.
+        """
+        path = path or self.output_path
+        timings_path = f"{path}.timings"
+
+        with self._lock:
+            samples = list(self.samples.items())
+            timings = list(self.timings.items())
+
+        try:
+            with open(path, "w") as f:
+                for stack, count in samples:
+                    f.write(f"{stack} {count}\n")
+
+            # Timings are folded too, weighted by self time in microseconds, since
+            # flame graph tools add child widths onto their parent
+            with open(timings_path, "w") as f:
+                for name, (calls, total) in timings:
+                    children = sum(child_total for child, (_, child_total) in timings
+                                   if child.startswith(f"{name};")
+                                   and ";" not in child[len(name) + 1:])
+                    f.write(f"{name} {round(max(total - children, 0.0) * 1_000_000)}\n")
+        except OSError as e:
+            logger.error(f"Error writing profile dump: {e}")
+            return
+
+        logger.info(f"Profile written to {path} and {timings_path} "
+                    f"({self._slow_counter.count} slow callbacks)")
+        for name, (calls, total) in sorted(timings, key=lambda item: item[1][1], reverse=True)[:10]:
+            logger.info(f"  {name}: {calls} calls, {total * 1000:.1f}ms total, "
+                        f"{total * 1000 / calls:.1f}ms avg")
+
+    def _wrap_handler(self, name: str, method):
+        @functools.wraps(method)
+        async def timed(*args, **kwargs):
+            # Nest under a handler awaiting us in the same task (e.g. outer;inner)
+            task = asyncio.current_task()
+            parent = _current_handler.get()
+            path = f"{parent[0]};{name}" if parent and parent[1] is task else name
+            token = _current_handler.set((path, task))
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.record(path, time.perf_counter() - start)
+                _current_handler.reset(token)
+
+        return timed
+
+    def _sample_loop(self):
+        """Background thread: periodically capture the loop thread's stack"""
+        while not self._stop_event.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                frame = frame.f_back
+            folded = ";".join(reversed(stack))
+
+            with self._lock:
+                self.samples[folded] += 1
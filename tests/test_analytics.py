@@ -0,0 +1,122 @@
+"""
+Usage analytics tests
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import CountMinSketch, HourBucket, HyperLogLog, RoomStats, UsageAnalytics
+
+
+def test_hyperloglog_small_counts_are_exact():
+    hll = HyperLogLog()
+    for i in range(50):
+        hll.add(f"user{i}")
+        hll.add(f"user{i}")  # duplicates are not counted twice
+    assert abs(hll.count() - 50) <= 1
+
+
+def test_hyperloglog_large_count_within_error_bound():
+    hll = HyperLogLog()
+    for i in range(20000):
+        hll.add(f"user{i}")
+    # Standard error is 1.04 / sqrt(1024) ~ 3.3%; allow three of those
+    assert abs(hll.count() - 20000) <= 20000 * 0.1
+
+
+def test_hyperloglog_merge_is_union():
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(300):
+        a.add(f"user{i}")
+    for i in range(200, 500):
+        b.add(f"user{i}")
+    a.merge(b)
+    assert abs(a.count() - 500) <= 500 * 0.1
+
+
+def test_count_min_never_underestimates():
+    sketch = CountMinSketch()
+    for i in range(200):
+        sketch.add(f"emote{i}", count=i + 1)
+    for i in range(200):
+        assert sketch.estimate(f"emote{i}") >= i + 1
+
+
+def test_top_k_replaces_lowest():
+    sketch = CountMinSketch(top_k=3)
+    for name, count in [("a", 5), ("b", 4), ("c", 3), ("d", 1)]:
+        sketch.add(name, count=count)
+    assert sketch.most_common() == [("a", 5), ("b", 4), ("c", 3)]
+
+    sketch.add("d", count=9)
+    assert sketch.most_common() == [("d", 10), ("a", 5), ("b", 4)]
+
+
+def test_summary_merges_top_k_across_hours():
+    room = RoomStats(window_hours=24)
+    room.bucket_for(100).emotes.add("wave", count=3)
+    room.bucket_for(100).emotes.add("sit", count=1)
+    room.bucket_for(101).emotes.add("sit", count=5)
+    room.bucket_for(101).emotes.add("kiss", count=2)
+
+    summary = room.summary(hours=2, now_hour=101)
+    assert summary["top_emotes"] == [("sit", 6), ("wave", 3), ("kiss", 2)]
+    assert room.summary(hours=1, now_hour=101)["top_emotes"] == [("sit", 5), ("kiss", 2)]
+
+
+def test_stale_bucket_reset_on_rollover():
+    room = RoomStats(window_hours=24)
+    old = room.bucket_for(100)
+    old.command_count = 7
+    old.commands.add("loop")
+    old.users.add("u1")
+
+    # Same ring slot, one full window later
+    bucket = room.bucket_for(124)
+    assert bucket is old
+    assert bucket.hour == 124
+    assert bucket.command_count == 0
+    assert bucket.commands.most_common() == []
+    assert bucket.users.count() == 0
+    # The expired hour no longer shows up in summaries
+    assert room.summary(hours=24, now_hour=124)["commands"] == 0
+
+
+def test_bucket_dict_round_trip():
+    bucket = HourBucket(42)
+    bucket.command_count = 3
+    bucket.commands.add("loop", count=3)
+    bucket.emotes.add("wave")
+    bucket.users.add("u1")
+
+    restored = HourBucket.from_dict(bucket.to_dict())
+    assert restored.to_dict() == bucket.to_dict()
+    assert restored.commands.estimate("loop") == 3
+
+
+def test_flush_and_load_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(UsageAnalytics, "_now_hour", staticmethod(lambda: 500000))
+    path = str(tmp_path / "analytics.json")
+
+    analytics = UsageAnalytics(path=path)
+    for i in range(40):
+        analytics.record_command("room", f"user{i % 15}", "loop" if i % 4 else "help")
+        analytics.record_emote("room", f"user{i % 15}", "wave" if i % 3 else "sit")
+    asyncio.run(analytics.flush())
+    assert not analytics.dirty
+
+    reloaded = UsageAnalytics(path=path)
+    reloaded.load()
+    assert reloaded.summary("room", hours=24) == analytics.summary("room", hours=24)
+    assert reloaded.summary("room")["commands"] == 40
+
+
+def test_flush_snapshot_does_not_share_live_top_dict():
+    bucket = HourBucket(1)
+    bucket.emotes.add("wave")
+    snapshot = bucket.to_dict()
+    bucket.emotes.add("sit")
+    assert snapshot["emotes"]["top"] == {"wave": 1}
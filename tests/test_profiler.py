@@ -0,0 +1,98 @@
+"""
+Profiler tests against a stub bot
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiler import LoopProfiler
+
+
+class StubHighrise:
+    """Stands in for the highrise client"""
+
+    async def chat(self, message: str):
+        await asyncio.sleep(0)
+
+    async def send_emote(self, emote_id: str, user_id: str):
+        await asyncio.sleep(0)
+
+
+class StubBot:
+    """Bot with nested handlers and a handler that spawns a background task"""
+
+    def __init__(self):
+        self.highrise = StubHighrise()
+        self.loop_task = None
+
+    async def handle_help_command(self):
+        await self.highrise.chat("help")
+        await self.handle_emotes_command()
+
+    async def handle_emotes_command(self):
+        await self.highrise.chat("emotes")
+
+    async def handle_loop_command(self):
+        self.loop_task = asyncio.create_task(self.emote_loop_task())
+
+    async def emote_loop_task(self):
+        await self.highrise.send_emote("wave", "u1")
+
+
+def test_attribution_paths():
+    async def scenario():
+        profiler = LoopProfiler()
+        bot = StubBot()
+        profiler.instrument(bot)
+        profiler.wrap_highrise(bot)
+        await bot.handle_help_command()
+        await bot.handle_loop_command()
+        await bot.loop_task
+        return profiler
+
+    profiler = asyncio.run(scenario())
+    assert set(profiler.timings) == {
+        "handle_help_command",
+        "handle_help_command;highrise.chat",
+        "handle_help_command;handle_emotes_command",
+        "handle_help_command;handle_emotes_command;highrise.chat",
+        "handle_loop_command",
+        # Spawned tasks are attributed to their own coroutine, not the handler
+        "StubBot.emote_loop_task;highrise.send_emote",
+    }
+
+
+def test_dump_writes_self_time(tmp_path):
+    profiler = LoopProfiler(output_path=str(tmp_path / "profile.folded"))
+    profiler.record("outer", 0.3)
+    profiler.record("outer;inner", 0.2)
+    profiler.record("outer;inner;highrise.chat", 0.05)
+    profiler.samples["main;run"] = 4
+    profiler.dump()
+
+    assert (tmp_path / "profile.folded").read_text() == "main;run 4\n"
+    lines = (tmp_path / "profile.folded.timings").read_text().splitlines()
+    assert sorted(lines) == [
+        "outer 100000",
+        "outer;inner 150000",
+        "outer;inner;highrise.chat 50000",
+    ]
+
+
+def test_stop_restores_loop_debug(tmp_path):
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        loop.set_debug(False)
+        loop.slow_callback_duration = 0.5
+        profiler = LoopProfiler(slow_callback_ms=10, output_path=str(tmp_path / "profile.folded"))
+        profiler.start(loop)
+        started = (loop.get_debug(), loop.slow_callback_duration)
+        profiler.stop()
+        return started, (loop.get_debug(), loop.slow_callback_duration)
+
+    started, stopped = asyncio.run(scenario())
+    assert started == (True, 0.01)
+    assert stopped == (False, 0.5)
@@ -0,0 +1,110 @@
+"""
+Worker pool tests against a local stub session runner
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worker_pool import WorkerPool
+
+
+class StubHighrise:
+    """Stands in for a connected highrise client"""
+
+    def __init__(self, name: str, fail_with=None, failures: int = 0):
+        self.name = name
+        self.fail_with = fail_with
+        self.failures = failures
+        self.emotes = []
+
+    async def send_emote(self, emote_id: str, user_id: str):
+        if self.failures:
+            self.failures -= 1
+            raise self.fail_with
+        self.emotes.append((emote_id, user_id))
+
+
+def stub_runner(clients):
+    """Runner that 'connects' each helper to its stub and stays connected"""
+    async def runner(session, room_id):
+        session.mark_connected(clients[session.token])
+        await asyncio.Event().wait()
+    return runner
+
+
+async def started_pool(clients, **kwargs):
+    pool = WorkerPool("room", list(clients), runner=stub_runner(clients), **kwargs)
+    pool.start()
+    await asyncio.sleep(0)
+    return pool
+
+
+def test_least_loaded_assignment():
+    async def scenario():
+        clients = {"a": StubHighrise("a"), "b": StubHighrise("b")}
+        pool = await started_pool(clients)
+        for user_id in ["u1", "u2", "u3", "u4"]:
+            await pool.send_emote("wave", user_id)
+        # Ticks for the same user stay on the same helper
+        await pool.send_emote("wave", "u1")
+        await pool.stop()
+        return clients
+
+    clients = asyncio.run(scenario())
+    assert clients["a"].emotes == [("wave", "u1"), ("wave", "u3"), ("wave", "u1")]
+    assert clients["b"].emotes == [("wave", "u2"), ("wave", "u4")]
+
+
+@pytest.mark.parametrize("error", [ConnectionResetError("closed"), RuntimeError("sdk error")])
+def test_failover_to_other_helper(error):
+    async def scenario():
+        clients = {"a": StubHighrise("a", fail_with=error, failures=1), "b": StubHighrise("b")}
+        pool = await started_pool(clients)
+        await pool.send_emote("wave", "u1")
+        await pool.stop()
+        return clients
+
+    clients = asyncio.run(scenario())
+    assert clients["a"].emotes == []
+    assert clients["b"].emotes == [("wave", "u1")]
+
+
+def test_fallback_when_all_helpers_fail():
+    async def scenario():
+        clients = {"a": StubHighrise("a", fail_with=RuntimeError("sdk error"), failures=1)}
+        primary = StubHighrise("primary")
+        pool = await started_pool(clients)
+        await pool.send_emote("wave", "u1", fallback=primary)
+        await pool.stop()
+        return primary
+
+    primary = asyncio.run(scenario())
+    assert primary.emotes == [("wave", "u1")]
+
+
+def test_failed_helper_returns_after_cooldown():
+    now = [1000.0]
+
+    async def scenario():
+        clients = {"a": StubHighrise("a", fail_with=asyncio.TimeoutError(), failures=1),
+                   "b": StubHighrise("b")}
+        pool = await started_pool(clients, cooldown=5.0, time_fn=lambda: now[0])
+        await pool.send_emote("wave", "u1")
+        states = [pool.sessions[0].ready]
+        now[0] += 4.9
+        states.append(pool.sessions[0].ready)
+        now[0] += 0.1
+        states.append(pool.sessions[0].ready)
+        await pool.send_emote("wave", "u2")
+        await pool.stop()
+        return clients, states
+
+    clients, states = asyncio.run(scenario())
+    assert states == [False, False, True]
+    assert clients["a"].emotes == [("wave", "u2")]
+    assert clients["b"].emotes == [("wave", "u1")]
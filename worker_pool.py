@@ -0,0 +1,171 @@
+"""
+Worker Pool - helper bot sessions for spreading rate-limited actions
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class HelperSession:
+    """One extra bot connection and the work currently assigned to it"""
+
+    def __init__(self, index: int, token: str, time_fn: Callable[[], float] = time.monotonic):
+        self.index = index
+        self.token = token
+        self.time_fn = time_fn
+        self.highrise = None  # set by the runner once connected
+        self.connected = False
+        self.cooldown_until = 0.0  # time_fn() value before which the helper is skipped
+        self.in_flight = 0
+        self.assigned: Set[str] = set()  # keys (user ids) pinned to this helper
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.connected and self.time_fn() >= self.cooldown_until
+
+    @property
+    def load(self) -> int:
+        return len(self.assigned) + self.in_flight
+
+    def mark_connected(self, highrise):
+        """Called by the runner when the session is (re)connected"""
+        self.highrise = highrise
+        self.connected = True
+        self.cooldown_until = 0.0
+        logger.info(f"Helper {self.index} connected")
+
+
+# A runner connects one helper and returns when its session ends. It must call
+# session.mark_connected(highrise) once the connection is usable.
+SessionRunner = Callable[[HelperSession, str], Awaitable[None]]
+
+
+class WorkerPool:
+    """Spreads actions across helper sessions by least-loaded assignment"""
+
+    def __init__(self, room_id: str, tokens: List[str], runner: SessionRunner,
+                 retry_delay: float = 10.0, cooldown: float = 5.0,
+                 time_fn: Callable[[], float] = time.monotonic):
+        self.room_id = room_id
+        self.runner = runner
+        self.retry_delay = retry_delay
+        self.cooldown = cooldown
+        self.time_fn = time_fn
+        self.sessions = [HelperSession(i, token, time_fn) for i, token in enumerate(tokens, 1)]
+        self.assignments: Dict[str, HelperSession] = {}  # key -> session
+        self.started = False
+
+    @property
+    def has_helpers(self) -> bool:
+        return any(session.ready for session in self.sessions)
+
+    def start(self):
+        """Connect every helper in the background"""
+        if self.started:
+            return
+        self.started = True
+        for session in self.sessions:
+            session.task = asyncio.create_task(self._supervise(session))
+        logger.info(f"Worker pool starting {len(self.sessions)} helper(s)")
+
+    async def stop(self):
+        """Disconnect all helpers"""
+        tasks = [session.task for session in self.sessions if session.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for session in self.sessions:
+            session.task = None
+            session.connected = False
+        self.assignments.clear()
+        self.started = False
+
+    def assign(self, key: str) -> Optional[HelperSession]:
+        """Pin a key to a helper, keeping the existing one while it is healthy"""
+        session = self.assignments.get(key)
+        if session and session.ready:
+            return session
+        if session:
+            session.assigned.discard(key)
+
+        session = self._least_loaded()
+        if session is None:
+            self.assignments.pop(key, None)
+            return None
+        session.assigned.add(key)
+        self.assignments[key] = session
+        return session
+
+    def release(self, key: str):
+        """Forget a key's helper assignment (e.g. when a loop stops)"""
+        session = self.assignments.pop(key, None)
+        if session:
+            session.assigned.discard(key)
+
+    async def run(self, action: Callable, fallback=None, key: Optional[str] = None):
+        """Run action(highrise) on a helper, failing over to others and then to fallback"""
+        tried: Set[int] = set()
+        last_error: Optional[Exception] = None
+        while True:
+            session = self.assign(key) if key else self._least_loaded()
+            if session is None or session.index in tried:
+                break
+            tried.add(session.index)
+
+            session.in_flight += 1
+            try:
+                return await action(session.highrise)
+            except Exception as e:
+                logger.warning(f"Helper {session.index} failed, failing over: {e}")
+                self._cool_down(session)
+                last_error = e
+            finally:
+                session.in_flight -= 1
+
+        if fallback is not None:
+            return await action(fallback)
+        if last_error is not None:
+            raise last_error
+        raise ConnectionError("No helper sessions available")
+
+    async def send_emote(self, emote_id: str, user_id: str, fallback=None):
+        """Send one emote tick, keeping each user's loop on the same helper"""
+        return await self.run(lambda highrise: highrise.send_emote(emote_id, user_id),
+                              fallback=fallback, key=user_id)
+
+    def _least_loaded(self) -> Optional[HelperSession]:
+        ready = [session for session in self.sessions if session.ready]
+        if not ready:
+            return None
+        return min(ready, key=lambda session: session.load)
+
+    def _release_all(self, session: HelperSession):
+        """Move a helper's keys elsewhere on their next use"""
+        for key in list(session.assigned):
+            self.assignments.pop(key, None)
+        session.assigned.clear()
+
+    def _cool_down(self, session: HelperSession):
+        """Skip a failing helper for a while; it rejoins rotation afterwards"""
+        session.cooldown_until = self.time_fn() + self.cooldown
+        self._release_all(session)
+
+    async def _supervise(self, session: HelperSession):
+        """Keep a helper connected, reconnecting after it drops"""
+        while True:
+            try:
+                await self.runner(session, self.room_id)
+                logger.warning(f"Helper {session.index} session ended")
+            except asyncio.CancelledError:
+                session.connected = False
+                raise
+            except Exception as e:
+                logger.error(f"Helper {session.index} disconnected: {e}")
+            session.connected = False
+            self._release_all(session)
+            await asyncio.sleep(self.retry_delay)